@@ -1,6 +1,6 @@
 """Main compiler interface"""
 
-from typing import Tuple, List, Dict, Any, Optional
+from typing import Tuple, List, Dict, Any, Optional, Callable
 from .models import Schema
 from .parser import NLParser
 from .migration import MigrationGenerator
@@ -11,8 +11,12 @@ from .visualizer import ERDVisualizer
 class DBSchemaCompiler:
     """Main compiler interface for NL to Database Schema"""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.schema: Optional[Schema] = None
+        # Rendered outputs for the current schema, tagged with the Schema.version
+        # they were built from; reset by compile()/load_schema() or on mutation
+        self._format_cache: Dict[Tuple[str, ...], str] = {}
+        self._format_version: Optional[Tuple] = None
     
     def compile(self, nl_description: str, schema_name: str = "database") -> 'DBSchemaCompiler':
         """
@@ -25,20 +29,50 @@ class DBSchemaCompiler:
         Returns:
             Self for method chaining
         """
+        # NLParser.parse memoizes results and returns a fresh copy each call
         self.schema = NLParser.parse(nl_description)
         self.schema.name = schema_name
+        self._format_cache.clear()
         return self
     
+    @staticmethod
+    def clear_cache():
+        """Clear cached compilation results"""
+        NLParser.cache_clear()
+    
     def load_schema(self, schema: Schema) -> 'DBSchemaCompiler':
-        """Load an existing schema object"""
+        """
+        Load an existing schema object
+        
+        Tables, columns and relationships added afterwards are picked up
+        automatically; call this again after editing existing objects in place
+        so that cached exports are rebuilt.
+        """
+        schema.touch()
         self.schema = schema
+        self._format_cache.clear()
         return self
     
+    def _cached_format(
+        self, schema: Schema, key: Tuple[str, ...], render: Callable[[Schema], str]
+    ) -> str:
+        """Return a rendered output for the current schema, rendering it at most once per version"""
+        version = schema.version
+        if version != self._format_version:
+            self._format_cache.clear()
+            self._format_version = version
+        
+        result = self._format_cache.get(key)
+        if result is None:
+            result = render(schema)
+            self._format_cache[key] = result
+        return result
+    
     def to_dbml(self) -> str:
         """Export to DBML format"""
         if not self.schema:
             raise ValueError("No schema compiled. Call compile() first.")
-        return self.schema.to_dbml()
+        return self._cached_format(self.schema, ("dbml",), Schema.to_dbml)
     
     def validate(self) -> Tuple[bool, List[str]]:
         """
@@ -64,38 +98,48 @@ class DBSchemaCompiler:
         """
         if not self.schema:
             raise ValueError("No schema compiled. Call compile() first.")
-        return MigrationGenerator.generate_sql(self.schema, dialect)
+        return self._cached_format(
+            self.schema,
+            ("sql", dialect),
+            lambda schema: MigrationGenerator.generate_sql(schema, dialect),
+        )
     
-    def generate_test_data(self, num_rows: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+    def generate_test_data(
+        self,
+        num_rows: int = 10,
+        seed: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Generate test data
         
         Args:
             num_rows: Number of rows per table
+            seed: Optional seed for reproducible output
             
         Returns:
             Dictionary mapping table names to lists of row dictionaries
         """
         if not self.schema:
             raise ValueError("No schema compiled. Call compile() first.")
-        return TestDataGenerator.generate(self.schema, num_rows)
+        return TestDataGenerator.generate(self.schema, num_rows, seed)
     
     def visualize_ascii(self) -> str:
         """Generate ASCII ERD visualization"""
         if not self.schema:
             raise ValueError("No schema compiled. Call compile() first.")
-        return ERDVisualizer.to_ascii(self.schema)
-   def visualize_mermaid(self) -> str:
+        return self._cached_format(self.schema, ("ascii",), ERDVisualizer.to_ascii)
+    
+    def visualize_mermaid(self) -> str:
         """Generate Mermaid diagram code"""
         if not self.schema:
             raise ValueError("No schema compiled. Call compile() first.")
-        return ERDVisualizer.to_mermaid(self.schema)
+        return self._cached_format(self.schema, ("mermaid",), ERDVisualizer.to_mermaid)
     
     def visualize_html(self) -> str:
         """Generate HTML table visualization"""
         if not self.schema:
             raise ValueError("No schema compiled. Call compile() first.")
-        return ERDVisualizer.to_html_table(self.schema)
+        return self._cached_format(self.schema, ("html",), ERDVisualizer.to_html_table)
     
     def get_schema(self) -> Schema:
         """Get the compiled schema object"""
@@ -108,12 +152,16 @@ class DBSchemaCompiler:
         if not self.schema:
             raise ValueError("No schema compiled. Call compile() first.")
         
-        total_columns = sum(len(table.columns) for table in self.schema.tables.values())
-        total_pks = sum(len(table.get_primary_keys()) for table in self.schema.tables.values())
-        total_fks = sum(
-            1 for table in self.schema.tables.values() 
-            for col in table.columns if col.references
-        )
+        total_columns = total_pks = total_fks = 0
+        table_names = []
+        for table_name, table in self.schema.tables.items():
+            table_names.append(table_name)
+            for col in table.columns:
+                total_columns += 1
+                if col.primary_key:
+                    total_pks += 1
+                if col.references:
+                    total_fks += 1
         
         return {
             "schema_name": self.schema.name,
@@ -122,5 +170,5 @@ class DBSchemaCompiler:
             "total_columns": total_columns,
             "total_primary_keys": total_pks,
             "total_foreign_keys": total_fks,
-            "tables": list(self.schema.tables.keys())
+            "tables": table_names
         }
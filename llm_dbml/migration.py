@@ -4,6 +4,32 @@ from typing import Dict, Callable
 from .models import Schema, Table, Column, DataType
 
 
+# Primary key clauses per dialect
+_PG_PK = "SERIAL PRIMARY KEY"
+_MYSQL_PK = "PRIMARY KEY AUTO_INCREMENT"
+
+# SQL type names per dialect (VARCHAR is sized per column)
+_SQL_TYPE_PG: Dict[DataType, str] = {
+    DataType.INTEGER: "INTEGER",
+    DataType.BIGINT: "BIGINT",
+    DataType.TEXT: "TEXT",
+    DataType.BOOLEAN: "BOOLEAN",
+    DataType.DATE: "DATE",
+    DataType.DATETIME: "TIMESTAMP",
+    DataType.TIMESTAMP: "TIMESTAMP",
+    DataType.DECIMAL: "DECIMAL(10,2)",
+    DataType.FLOAT: "FLOAT",
+    DataType.JSON: "JSON",
+    DataType.UUID: "UUID",
+}
+_SQL_TYPE_GENERIC: Dict[DataType, str] = {
+    **_SQL_TYPE_PG,
+    DataType.BOOLEAN: "TINYINT(1)",
+    DataType.JSON: "TEXT",
+    DataType.UUID: "VARCHAR(36)",
+}
+
+
 class MigrationGenerator:
     """Generate SQL migrations from schema"""
     
@@ -29,33 +55,31 @@ class MigrationGenerator:
     @staticmethod
     def _create_table_sql(table: Table, dialect: str) -> str:
         """Generate CREATE TABLE statement"""
-        lines = [f"CREATE TABLE {table.name} ("]
-        
         col_defs = []
         for col in table.columns:
-            col_def = f"  {col.name} {MigrationGenerator._sql_type(col, dialect)}"
-            
             if col.primary_key:
                 if dialect == "postgresql":
-                    col_def = f"  {col.name} SERIAL PRIMARY KEY"
+                    parts = [f"  {col.name}", _PG_PK]
                 else:
-                    col_def += " PRIMARY KEY AUTO_INCREMENT"
+                    parts = [
+                        f"  {col.name}",
+                        MigrationGenerator._sql_type(col, dialect),
+                        _MYSQL_PK,
+                    ]
             else:
+                parts = [f"  {col.name}", MigrationGenerator._sql_type(col, dialect)]
                 if not col.nullable:
-                    col_def += " NOT NULL"
+                    parts.append("NOT NULL")
                 if col.unique:
-                    col_def += " UNIQUE"
+                    parts.append("UNIQUE")
                 if col.default:
-                    col_def += f" DEFAULT {col.default}"
+                    parts.append(f"DEFAULT {col.default}")
                 if col.references:
-                    col_def += f" REFERENCES {col.references[0]}({col.references[1]})"
+                    parts.append(f"REFERENCES {col.references[0]}({col.references[1]})")
             
-            col_defs.append(col_def)
-        
-        lines.append(",\n".join(col_defs))
-        lines.append(");")
+            col_defs.append(" ".join(parts))
         
-        return "\n".join(lines)
+        return f"CREATE TABLE {table.name} (\n" + ",\n".join(col_defs) + "\n);"
     
     @staticmethod
     def _sql_type(col: Column, dialect: str) -> str:
@@ -63,19 +87,8 @@ class MigrationGenerator:
         if col.primary_key and col.data_type == DataType.INTEGER:
             return "SERIAL" if dialect == "postgresql" else "INTEGER"
         
-        type_map = {
-            DataType.INTEGER: "INTEGER",
-            DataType.BIGINT: "BIGINT",
-            DataType.VARCHAR: f"VARCHAR({col.length or 255})",
-            DataType.TEXT: "TEXT",
-            DataType.BOOLEAN: "BOOLEAN" if dialect == "postgresql" else "TINYINT(1)",
-            DataType.DATE: "DATE",
-            DataType.DATETIME: "TIMESTAMP",
-            DataType.TIMESTAMP: "TIMESTAMP",
-            DataType.DECIMAL: "DECIMAL(10,2)",
-            DataType.FLOAT: "FLOAT",
-            DataType.JSON: "JSON" if dialect == "postgresql" else "TEXT",
-            DataType.UUID: "UUID" if dialect == "postgresql" else "VARCHAR(36)",
-        }
+        if col.data_type is DataType.VARCHAR:
+            return f"VARCHAR({col.length or 255})"
+        
+        type_map = _SQL_TYPE_PG if dialect == "postgresql" else _SQL_TYPE_GENERIC
         return type_map.get(col.data_type, "TEXT")
-
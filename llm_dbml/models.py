@@ -1,8 +1,10 @@
 """Core data models for database schema representation"""
 
+import copy
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterator
 
 
 class DataType(Enum):
@@ -41,12 +43,21 @@ class Column:
     length: Optional[int] = None
     references: Optional[Tuple[str, str]] = None  # (table, column)
     
+    @property
+    def type_str(self) -> str:
+        """Type as shown in diagrams, e.g. "varchar(255)" (cached per type/length)"""
+        if not self.length:
+            return self.data_type.value
+        cached: Optional[Tuple[DataType, int, str]] = self.__dict__.get("_type_str")
+        if cached is not None and cached[0] is self.data_type and cached[1] == self.length:
+            return cached[2]
+        type_str = f"{self.data_type.value}({self.length})"
+        self._type_str = (self.data_type, self.length, type_str)
+        return type_str
+    
     def to_dbml(self) -> str:
         """Convert column to DBML format"""
-        parts = [self.name, self.data_type.value]
-        
-        if self.length:
-            parts[1] = f"{self.data_type.value}({self.length})"
+        parts = [self.name, self.type_str]
         
         attrs = []
         if self.primary_key:
@@ -66,16 +77,31 @@ class Column:
         return " ".join(parts)
 
 
+class _ColumnView:
+    """Column attributes used by the renderers, laid out as parallel lists"""
+    
+    __slots__ = ("names", "type_strs", "primary_keys", "fk_targets")
+    
+    def __init__(self, columns: List[Column]):
+        self.names = [col.name for col in columns]
+        self.type_strs = [col.type_str for col in columns]
+        self.primary_keys = [col.primary_key for col in columns]
+        self.fk_targets = [col.references[0] if col.references else None for col in columns]
+
+
 @dataclass
 class Table:
     """Represents a database table"""
     name: str
     columns: List[Column] = field(default_factory=list)
     note: Optional[str] = None
+    # Bumped by add_column; part of Schema.version
+    _version: int = field(default=0, init=False, repr=False, compare=False)
     
     def add_column(self, column: Column):
         """Add a column to the table"""
         self.columns.append(column)
+        self._version += 1
     
     def get_primary_keys(self) -> List[Column]:
         """Get all primary key columns"""
@@ -88,15 +114,22 @@ class Table:
                 return col
         return None
     
+    def column_view(self) -> _ColumnView:
+        """Return a snapshot of the columns as parallel attribute lists"""
+        return _ColumnView(self.columns)
+    
     def to_dbml(self) -> str:
         """Convert table to DBML format"""
-        lines = [f"Table {self.name} {{"]
+        return "\n".join(self.iter_dbml())
+    
+    def iter_dbml(self) -> Iterator[str]:
+        """Yield the table's DBML output line by line"""
+        yield f"Table {self.name} {{"
         for col in self.columns:
-            lines.append(f"  {col.to_dbml()}")
+            yield f"  {col.to_dbml()}"
         if self.note:
-            lines.append(f"  Note: '{self.note}'")
-        lines.append("}")
-        return "\n".join(lines)
+            yield f"  Note: '{self.note}'"
+        yield "}"
 
 
 @dataclass
@@ -120,10 +153,36 @@ class Schema:
         self.name = name
         self.tables: Dict[str, Table] = {}
         self.relationships: List[Relationship] = []
+        self._revision = 0
+    
+    @property
+    def version(self) -> Tuple:
+        """
+        Token that changes whenever the schema is renamed or tables, columns or
+        relationships are added
+        
+        Direct appends to `tables`, `relationships` or a table's `columns`, and
+        tables replaced by new objects, are noticed too; call touch() after
+        editing existing objects in place.
+        """
+        return (
+            self._revision,
+            self.name,
+            len(self.relationships),
+            tuple(
+                (id(table), table._version, len(table.columns))
+                for table in self.tables.values()
+            ),
+        )
+    
+    def touch(self):
+        """Mark the schema as modified so cached renderings are rebuilt"""
+        self._revision += 1
     
     def add_table(self, table: Table):
         """Add a table to the schema"""
         self.tables[table.name] = table
+        self._revision += 1
     
     def get_table(self, name: str) -> Optional[Table]:
         """Get a table by name"""
@@ -132,21 +191,44 @@ class Schema:
     def add_relationship(self, rel: Relationship):
         """Add a relationship"""
         self.relationships.append(rel)
+        self._revision += 1
+    
+    def clone(self) -> 'Schema':
+        """
+        Return an independent copy of the schema
+        
+        Much cheaper than copy.deepcopy: columns and relationships only hold
+        immutable values, so a shallow copy of each is a full copy.
+        """
+        schema = Schema(self.name)
+        schema.tables = {
+            name: Table(
+                table.name,
+                [copy.copy(col) for col in table.columns],
+                table.note
+            )
+            for name, table in self.tables.items()
+        }
+        schema.relationships = [copy.copy(rel) for rel in self.relationships]
+        return schema
     
     def to_dbml(self) -> str:
         """Convert entire schema to DBML"""
-        lines = [f"// Database: {self.name}", ""]
+        return "\n".join(self.iter_dbml())
+    
+    def iter_dbml(self) -> Iterator[str]:
+        """Yield the schema's DBML output line by line (without newlines)"""
+        yield f"// Database: {self.name}"
+        yield ""
         
         for table in self.tables.values():
-            lines.append(table.to_dbml())
-            lines.append("")
+            yield from table.iter_dbml()
+            yield ""
         
         if self.relationships:
-            lines.append("// Relationships")
+            yield "// Relationships"
             for rel in self.relationships:
-                lines.append(rel.to_dbml())
-        
-        return "\n".join(lines)
+                yield rel.to_dbml()
     
     def validate(self) -> List[str]:
         """Validate relational integrity"""
@@ -158,17 +240,18 @@ class Schema:
             if not pks:
                 errors.append(f"Table '{table_name}' has no primary key")
         
-        # Validate foreign key references
+        # Validate foreign key references against per-table column name sets
+        colsets = {name: {c.name for c in t.columns} for name, t in self.tables.items()}
         for table_name, table in self.tables.items():
             for col in table.columns:
                 if col.references:
                     ref_table, ref_col = col.references
-                    if ref_table not in self.tables:
+                    if ref_table not in colsets:
                         errors.append(
                             f"Table '{table_name}.{col.name}' references "
                             f"non-existent table '{ref_table}'"
                         )
-                    elif ref_col not in [c.name for c in self.tables[ref_table].columns]:
+                    elif ref_col not in colsets[ref_table]:
                         errors.append(
                             f"Table '{table_name}.{col.name}' references "
                             f"non-existent column '{ref_table}.{ref_col}'"
@@ -176,11 +259,11 @@ class Schema:
         
         # Check for duplicate column names in tables
         for table_name, table in self.tables.items():
-            col_names = [col.name for col in table.columns]
-            duplicates = [name for name in col_names if col_names.count(name) > 1]
+            counts = Counter(col.name for col in table.columns)
+            duplicates = {name for name, count in counts.items() if count > 1}
             if duplicates:
                 errors.append(
-                    f"Table '{table_name}' has duplicate column names: {set(duplicates)}"
+                    f"Table '{table_name}' has duplicate column names: {duplicates}"
                 )
         
         # Validate relationship integrity
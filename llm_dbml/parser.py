@@ -1,10 +1,31 @@
 """Natural Language Parser for database schemas"""
 
 import re
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Set
 from .models import Schema, Table, Column, Relationship, DataType, RelationType
 
 
+# Precompiled patterns
+_SENTENCE_SPLIT_RE = re.compile(r'[.!;\n]')
+_TABLE_PATTERNS = [
+    re.compile(p) for p in (
+        r'(?:table|entity|create)\s+(?:called\s+)?["\']?(\w+)["\']?',
+        r'(\w+)\s+(?:table|entity)',
+        r'create\s+(\w+)',
+    )
+]
+# Keyword classifier; matches substrings like the original `in` checks did
+_CLASSIFIER_RE = re.compile(
+    r'(?P<table>table|entity|create)'
+    r'|(?P<has>has(?: many| one)?)'
+    r'|(?P<columns>with|contains|field|column)'
+    r'|(?P<relationship>references|links to|belongs to)'
+)
+_PHRASE_RE = re.compile(r'(has|with|contains|field|column|called|named)\s+')
+_SEP_RE = re.compile(r',|\sand\s')
+
+
 class NLParser:
     """Natural Language Parser for database schemas"""
     
@@ -22,11 +43,26 @@ class NLParser:
     
     @staticmethod
     def parse(nl_description: str) -> Schema:
-        """Parse natural language description into a schema"""
+        """Parse natural language description into a schema
+
+        Results are memoized per input string; each call returns a fresh
+        copy so callers may freely mutate the schema.
+        """
+        return NLParser._parse_cached(nl_description).clone()
+    
+    @staticmethod
+    def cache_clear():
+        """Clear the memoized parse results"""
+        NLParser._parse_cached.cache_clear()
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse_cached(nl_description: str) -> Schema:
+        """Parse a description into a canonical schema (never handed out directly)"""
         schema = Schema()
         
         # Split into sentences
-        sentences = re.split(r'[.!;\n]', nl_description)
+        sentences = _SENTENCE_SPLIT_RE.split(nl_description)
         
         current_table = None
         
@@ -35,27 +71,29 @@ class NLParser:
             if not sentence:
                 continue
             
+            kinds = NLParser._classify(sentence)
+            
             # Detect table creation
-            if any(keyword in sentence for keyword in ['table', 'entity', 'create']):
+            if 'table' in kinds:
                 table_name = NLParser._extract_table_name(sentence)
                 if table_name:
                     current_table = Table(name=table_name)
                     schema.add_table(current_table)
                     
                     # Check if columns are defined in same sentence
-                    if any(kw in sentence for kw in ['has', 'with', 'contains', 'field', 'column']):
+                    if 'columns' in kinds:
                         columns = NLParser._extract_columns(sentence)
                         for col in columns:
                             current_table.add_column(col)
             
             # Detect column definitions for current table
-            elif current_table and any(kw in sentence for kw in ['has', 'with', 'contains', 'field', 'column']):
+            elif current_table and 'columns' in kinds:
                 columns = NLParser._extract_columns(sentence)
                 for col in columns:
                     current_table.add_column(col)
             
             # Detect relationships
-            elif any(kw in sentence for kw in ['references', 'links to', 'belongs to', 'has many', 'has one']):
+            elif 'relationship' in kinds:
                 rel = NLParser._extract_relationship(sentence, schema)
                 if rel:
                     schema.add_relationship(rel)
@@ -89,17 +127,26 @@ class NLParser:
         
         return schema
     
+    @staticmethod
+    def _classify(sentence: str) -> Set[str]:
+        """Collect the statement kinds whose keywords appear in a sentence"""
+        kinds = set()
+        for match in _CLASSIFIER_RE.finditer(sentence):
+            group = match.lastgroup
+            if group == 'has':
+                # "has" introduces columns; "has many"/"has one" also a relationship
+                kinds.add('columns')
+                if match.end() - match.start() > 3:
+                    kinds.add('relationship')
+            elif group is not None:
+                kinds.add(group)
+        return kinds
+    
     @staticmethod
     def _extract_table_name(sentence: str) -> Optional[str]:
         """Extract table name from sentence"""
-        patterns = [
-            r'(?:table|entity|create)\s+(?:called\s+)?["\']?(\w+)["\']?',
-            r'(\w+)\s+(?:table|entity)',
-            r'create\s+(\w+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, sentence)
+        for pattern in _TABLE_PATTERNS:
+            match = pattern.search(sentence)
             if match:
                 name = match.group(1)
                 # Filter out common words
@@ -113,10 +160,10 @@ class NLParser:
         columns = []
         
         # Remove common phrases
-        sentence = re.sub(r'(has|with|contains|field|column|called|named)\s+', '', sentence)
+        sentence = _PHRASE_RE.sub('', sentence)
         
         # Split by common separators
-        parts = re.split(r',|\sand\s', sentence)
+        parts = _SEP_RE.split(sentence)
         
         for part in parts:
             part = part.strip()
@@ -134,29 +181,20 @@ class NLParser:
             if col_name in ['a', 'an', 'the', 'table', 'entity']:
                 continue
             
-            # Look for type keyword
-            data_type = DataType.VARCHAR  # default
-            nullable = True
-            length = None
-            
-            for word in words[1:]:
-                word = word.strip(',:;')
-                if word in NLParser.TYPE_KEYWORDS:
-                    data_type = NLParser.TYPE_KEYWORDS[word]
-                    break
+            # Look for type keyword (first match wins, later words are not stripped)
+            tokens = (word.strip(',:;') for word in words[1:])
+            data_type = next(
+                (NLParser.TYPE_KEYWORDS[t] for t in tokens if t in NLParser.TYPE_KEYWORDS),
+                DataType.VARCHAR,  # default
+            )
             
             # Check for constraints
-            if 'required' in part or 'not null' in part or 'mandatory' in part:
-                nullable = False
+            nullable = not ('required' in part or 'not null' in part or 'mandatory' in part)
             
             # Set length for varchar
+            length = None
             if data_type == DataType.VARCHAR:
-                if 'email' in col_name or 'email' in part:
-                    length = 255
-                elif 'phone' in col_name:
-                    length = 20
-                else:
-                    length = 255
+                length = 20 if 'phone' in col_name and 'email' not in part else 255
             
             columns.append(Column(
                 name=col_name,
@@ -3,7 +3,7 @@
 import random
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Optional
 from .models import Schema, Table, Column, DataType
 
 
@@ -13,107 +13,206 @@ class TestDataGenerator:
     FIRST_NAMES = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"]
     LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller"]
     
+    # Reference time for generated dates when a seed is given
+    SEED_REFERENCE_TIME = datetime(2024, 1, 1)
+    
     @staticmethod
-    def generate(schema: Schema, num_rows: int = 10) -> Dict[str, List[Dict[str, Any]]]:
-        """Generate test data for all tables"""
-        data = {}
-        
-        # Generate in order respecting foreign keys
-        generated_tables = set()
-        
-        while len(generated_tables) < len(schema.tables):
-            for table_name, table in schema.tables.items():
-                if table_name in generated_tables:
-                    continue
-                
-                # Check if all referenced tables are generated
-                can_generate = True
-                for col in table.columns:
-                    if col.references:
-                        ref_table = col.references[0]
-                        if ref_table not in generated_tables and ref_table != table_name:
-                            can_generate = False
-                            break
-                
-                if can_generate:
-                    data[table_name] = TestDataGenerator._generate_table_data(
-                        table, num_rows, data
-                    )
-                    generated_tables.add(table_name)
+    def generate(
+        schema: Schema,
+        num_rows: int = 10,
+        seed: Optional[int] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Generate test data for all tables
+        
+        Args:
+            schema: Schema to generate data for
+            num_rows: Number of rows per table
+            seed: Optional seed for reproducible output; dates are then
+                generated relative to SEED_REFERENCE_TIME instead of now
+        """
+        data: Dict[str, List[Dict[str, Any]]] = {}
+        rng = random.Random(seed)
+        now = datetime.now() if seed is None else TestDataGenerator.SEED_REFERENCE_TIME
+        
+        # Tables in one level only reference earlier levels
+        for level in TestDataGenerator._generation_levels(schema):
+            for table_name in level:
+                data[table_name] = TestDataGenerator._generate_table_data(
+                    schema.tables[table_name], num_rows, data, rng, now
+                )
         
         return data
     
+    @staticmethod
+    def _generation_levels(schema: Schema) -> List[List[str]]:
+        """
+        Group tables into dependency levels (Kahn's algorithm)
+        
+        Every table only references tables in earlier levels.
+        """
+        dependents: Dict[str, List[str]] = {name: [] for name in schema.tables}
+        pending: Dict[str, int] = {}
+        
+        for table_name, table in schema.tables.items():
+            deps = {
+                col.references[0] for col in table.columns
+                if col.references
+                and col.references[0] != table_name
+                and col.references[0] in schema.tables
+            }
+            pending[table_name] = len(deps)
+            for dep in deps:
+                dependents[dep].append(table_name)
+        
+        levels = []
+        resolved = 0
+        level = [name for name, count in pending.items() if count == 0]
+        while level:
+            levels.append(level)
+            resolved += len(level)
+            next_level = []
+            for table_name in level:
+                for dependent in dependents[table_name]:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        next_level.append(dependent)
+            level = next_level
+        
+        if resolved < len(schema.tables):
+            cyclic = sorted(name for name, count in pending.items() if count > 0)
+            raise ValueError(
+                f"Circular foreign key dependencies between tables: {', '.join(cyclic)}"
+            )
+        
+        return levels
+    
     @staticmethod
     def _generate_table_data(
         table: Table, 
         num_rows: int, 
-        existing_data: Dict[str, List[Dict[str, Any]]]
+        existing_data: Dict[str, List[Dict[str, Any]]],
+        rng: random.Random,
+        now: datetime
     ) -> List[Dict[str, Any]]:
         """Generate test data for a single table"""
-        rows = []
-        
-        for i in range(num_rows):
-            row = {}
-            for col in table.columns:
-                if col.primary_key and col.data_type == DataType.INTEGER:
-                    row[col.name] = i + 1
-                elif col.references:
-                    # Get a random id from referenced table
-                    ref_table, ref_col = col.references
-                    if ref_table in existing_data and existing_data[ref_table]:
-                        ref_row = random.choice(existing_data[ref_table])
-                        row[col.name] = ref_row.get(ref_col)
-                    else:
-                        row[col.name] = None
-                else:
-                    row[col.name] = TestDataGenerator._generate_value(col, i)
-            rows.append(row)
-        
-        return rows
+        if not table.columns:
+            return [{} for _ in range(num_rows)]
+        
+        # Build each column in one pass, then stitch the columns into rows
+        names = [col.name for col in table.columns]
+        columns = [
+            TestDataGenerator._generate_column(col, num_rows, existing_data, rng, now)
+            for col in table.columns
+        ]
+        return [dict(zip(names, values)) for values in zip(*columns)]
     
     @staticmethod
-    def _generate_value(col: Column, index: int) -> Any:
-        """Generate a single value based on column type"""
-        if col.nullable and random.random() < 0.1:
-            return None
+    def _generate_column(
+        col: Column,
+        num_rows: int,
+        existing_data: Dict[str, List[Dict[str, Any]]],
+        rng: random.Random,
+        now: datetime
+    ) -> List[Any]:
+        """Generate all values for a single column"""
+        if col.primary_key and col.data_type == DataType.INTEGER:
+            return list(range(1, num_rows + 1))
+        
+        if col.references:
+            # Pick random ids from the referenced table
+            ref_table, ref_col = col.references
+            ref_rows = existing_data.get(ref_table)
+            if not ref_rows:
+                return [None] * num_rows
+            ref_values = [ref_row.get(ref_col) for ref_row in ref_rows]
+            return rng.choices(ref_values, k=num_rows)
+        
+        generator = TestDataGenerator._make_column_generator(col, num_rows, rng, now)
+        return [generator(i) for i in range(num_rows)]
+    
+    @staticmethod
+    def _make_column_generator(
+        col: Column,
+        num_rows: int,
+        rng: random.Random,
+        now: datetime
+    ) -> Callable[[int], Any]:
+        """Build a value generator for a column, classifying the column only once"""
+        generator = TestDataGenerator._make_value_generator(col, num_rows, rng, now)
+        
+        if not col.nullable:
+            return generator
+        
+        def nullable_generator(index: int) -> Any:
+            if rng.random() < 0.1:
+                return None
+            return generator(index)
+        
+        return nullable_generator
+    
+    @staticmethod
+    def _make_value_generator(
+        col: Column,
+        num_rows: int,
+        rng: random.Random,
+        now: datetime
+    ) -> Callable[[int], Any]:
+        """
+        Build a non-null value generator based on column type
+        
+        Values drawn from a fixed population are sampled for all rows up
+        front and looked up by row index. Dates are relative to `now`.
+        """
+        first_names = TestDataGenerator.FIRST_NAMES
+        last_names = TestDataGenerator.LAST_NAMES
         
         if col.data_type == DataType.INTEGER:
-            return random.randint(1, 1000)
+            return lambda index: rng.randrange(1, 1001)
         elif col.data_type == DataType.BIGINT:
-            return random.randint(1000000, 9999999999)
+            return lambda index: rng.randrange(1000000, 10000000000)
         elif col.data_type == DataType.VARCHAR:
-            if 'email' in col.name.lower():
-                return f"user{index}@example.com"
-            elif 'first' in col.name.lower() and 'name' in col.name.lower():
-                return random.choice(TestDataGenerator.FIRST_NAMES)
-            elif 'last' in col.name.lower() and 'name' in col.name.lower():
-                return random.choice(TestDataGenerator.LAST_NAMES)
-            elif 'name' in col.name.lower():
-                first = random.choice(TestDataGenerator.FIRST_NAMES)
-                last = random.choice(TestDataGenerator.LAST_NAMES)
-                return f"{first} {last}"
-            elif 'phone' in col.name.lower():
-                return f"+1-555-{random.randint(100,999)}-{random.randint(1000,9999)}"
-            elif 'title' in col.name.lower():
-                return f"Title {index + 1}"
+            name = col.name.lower()
+            if 'email' in name:
+                return lambda index: f"user{index}@example.com"
+            elif 'first' in name and 'name' in name:
+                return rng.choices(first_names, k=num_rows).__getitem__
+            elif 'last' in name and 'name' in name:
+                return rng.choices(last_names, k=num_rows).__getitem__
+            elif 'name' in name:
+                firsts = rng.choices(first_names, k=num_rows)
+                lasts = rng.choices(last_names, k=num_rows)
+                return lambda index: f"{firsts[index]} {lasts[index]}"
+            elif 'phone' in name:
+                return lambda index: (
+                    f"+1-555-{rng.randrange(100, 1000)}-{rng.randrange(1000, 10000)}"
+                )
+            elif 'title' in name:
+                return lambda index: f"Title {index + 1}"
             else:
-                return f"value_{index}"
+                return lambda index: f"value_{index}"
         elif col.data_type == DataType.TEXT:
-            return f"This is sample text content for row {index}. Lorem ipsum dolor sit amet."
+            return lambda index: (
+                f"This is sample text content for row {index}. Lorem ipsum dolor sit amet."
+            )
         elif col.data_type == DataType.BOOLEAN:
-            return random.choice([True, False])
+            return rng.choices([True, False], k=num_rows).__getitem__
         elif col.data_type == DataType.DATE:
-            date = datetime.now() - timedelta(days=random.randint(0, 365))
-            return date.date().isoformat()
+            return lambda index: (
+                now - timedelta(days=rng.randrange(0, 366))
+            ).date().isoformat()
         elif col.data_type == DataType.DATETIME or col.data_type == DataType.TIMESTAMP:
-            dt = datetime.now() - timedelta(hours=random.randint(0, 8760))
-            return dt.isoformat()
+            return lambda index: (
+                now - timedelta(hours=rng.randrange(0, 8761))
+            ).isoformat()
         elif col.data_type == DataType.DECIMAL or col.data_type == DataType.FLOAT:
-            return round(random.uniform(10, 1000), 2)
+            return lambda index: round(rng.uniform(10, 1000), 2)
         elif col.data_type == DataType.JSON:
-            return json.dumps({"key": f"value_{index}", "index": index})
+            return lambda index: json.dumps({"key": f"value_{index}", "index": index})
         elif col.data_type == DataType.UUID:
-            hex_str = f"{random.randint(0, 0xffffffff):08x}"
-            return f"{hex_str[:8]}-{hex_str[8:12]}-4000-8000-{random.randint(0, 0xffffffffffff):012x}"
+            def uuid_value(index: int) -> str:
+                hex_str = f"{rng.getrandbits(128):032x}"
+                return f"{hex_str[:8]}-{hex_str[8:12]}-4000-8000-{hex_str[20:]}"
+            return uuid_value
         
-        return None
+        return lambda index: None
@@ -1,6 +1,85 @@
 """ERD Visualization Tools"""
 
-from .models import Schema, RelationType
+import io
+from functools import lru_cache
+from typing import Callable, Dict
+from .models import Schema, Table, Column, RelationType
+
+
+# Mermaid cardinality notation per relationship type
+_MERMAID_REL_SYMBOL: Dict[RelationType, str] = {
+    RelationType.ONE_TO_ONE: "||--||",
+    RelationType.ONE_TO_MANY: "||--o{",
+    RelationType.MANY_TO_ONE: "}o--||",
+    RelationType.MANY_TO_MANY: "}o--o{",
+}
+
+# Precomputed ASCII borders; widths are sliced from one shared run of dashes
+_ASCII_DASH_MAX = "─" * 256
+_ASCII_FOOTER = "\n└" + _ASCII_DASH_MAX[:40]
+
+# Escapes for names interpolated into HTML output
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# Interned per-target labels, bounded for long-running processes
+_LABEL_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=_LABEL_CACHE_SIZE)
+def _fk_label(target: str) -> str:
+    """Return the shared "FK → target" label for an HTML constraints cell"""
+    return f"FK → {target.translate(_HTML_ESCAPE)}"
+
+
+@lru_cache(maxsize=_LABEL_CACHE_SIZE)
+def _ref_arrow(target: str) -> str:
+    """Return the shared " → target" suffix for an ASCII column line"""
+    return f" → {target}"
+
+
+# Constraint-shape bits for HTML rows
+_HTML_PK = 8
+_HTML_NOT_NULL = 4
+_HTML_UNIQUE = 2
+_HTML_FK = 1
+
+
+def _html_flags(col: Column) -> int:
+    """Encode the constraints shown for a column as a bitmask"""
+    return (
+        (_HTML_PK if col.primary_key else 0)
+        | (0 if col.nullable else _HTML_NOT_NULL)
+        | (_HTML_UNIQUE if col.unique else 0)
+        | (_HTML_FK if col.references else 0)
+    )
+
+
+@lru_cache(maxsize=None)
+def _html_row_formatter(flags: int) -> Callable[[Column], str]:
+    """Build an HTML row emitter specialized for one constraint shape"""
+    constraints = "PK" if flags & _HTML_PK else ""
+    if flags & _HTML_NOT_NULL:
+        constraints += ", NOT NULL" if constraints else "NOT NULL"
+    if flags & _HTML_UNIQUE:
+        constraints += ", UNIQUE" if constraints else "UNIQUE"
+    
+    if not flags & _HTML_FK:
+        tail = f"</td><td>{constraints}</td></tr>"
+        return lambda col: (
+            f"\n<tr><td>{col.name.translate(_HTML_ESCAPE)}</td><td>{col.type_str}{tail}"
+        )
+    
+    fk_prefix = f"</td><td>{constraints}, " if constraints else "</td><td>"
+    
+    def fk_row(col: Column) -> str:
+        # Only used for columns with the FK bit set
+        assert col.references is not None
+        return (
+            f"\n<tr><td>{col.name.translate(_HTML_ESCAPE)}</td><td>{col.type_str}{fk_prefix}"
+            f"{_fk_label(col.references[0])}</td></tr>"
+        )
+    
+    return fk_row
 
 
 class ERDVisualizer:
@@ -9,87 +88,79 @@ class ERDVisualizer:
     @staticmethod
     def to_mermaid(schema: Schema) -> str:
         """Generate Mermaid ER diagram"""
-        lines = ["erDiagram"]
+        buf = io.StringIO()
+        write = buf.write
+        write("erDiagram")
         
         # Add tables with columns
-        for table in schema.tables.values():
-            lines.append(f"  {table.name} {{")
-            for col in table.columns:
-                key = ""
-                if col.primary_key:
-                    key = "PK"
-                elif col.references:
-                    key = "FK"
-                
-                type_str = col.data_type.value
-                if col.length:
-                    type_str += f"({col.length})"
-                
-                lines.append(f"    {type_str} {col.name} {key}")
-            lines.append("  }")
+        buf.writelines([
+            ERDVisualizer._render_mermaid_table(table) for table in schema.tables.values()
+        ])
+        
+        if not schema.relationships:
+            return buf.getvalue()
         
         # Add relationships
-        for rel in schema.relationships:
-            if rel.rel_type == RelationType.ONE_TO_ONE:
-                symbol = "||--||"
-            elif rel.rel_type == RelationType.ONE_TO_MANY:
-                symbol = "||--o{"
-            elif rel.rel_type == RelationType.MANY_TO_ONE:
-                symbol = "}o--||"
-            else:  # MANY_TO_MANY
-                symbol = "}o--o{"
-            
-            lines.append(f"  {rel.from_table} {symbol} {rel.to_table} : \"\"")
+        buf.writelines([
+            f'\n  {rel.from_table} {_MERMAID_REL_SYMBOL[rel.rel_type]} {rel.to_table} : ""'
+            for rel in schema.relationships
+        ])
         
-        return "\n".join(lines)
+        return buf.getvalue()
+    
+    @staticmethod
+    def _render_mermaid_table(table: Table) -> str:
+        """Render one table block of a Mermaid ER diagram"""
+        view = table.column_view()
+        lines = [
+            f"\n    {type_str} {name} {'PK' if pk else ('FK' if fk is not None else '')}"
+            for type_str, name, pk, fk in zip(
+                view.type_strs, view.names, view.primary_keys, view.fk_targets
+            )
+        ]
+        return f"\n  {table.name} {{{''.join(lines)}\n  }}"
     
     @staticmethod
     def to_ascii(schema: Schema) -> str:
         """Generate simple ASCII representation"""
-        lines = []
+        buf = io.StringIO()
+        write = buf.write
+        sep = ""  # newline between tables, none before the first
         
         for table in schema.tables.values():
-            lines.append(f"\n┌─ {table.name} " + "─" * max(0, 30 - len(table.name)))
+            write(f"{sep}\n┌─ {table.name} {_ASCII_DASH_MAX[:max(0, 30 - len(table.name))]}")
             for col in table.columns:
                 marker = "🔑" if col.primary_key else "  "
-                fk = f" → {col.references[0]}" if col.references else ""
-                type_info = f"{col.data_type.value}"
-                lines.append(f"│ {marker} {col.name}: {type_info}{fk}")
-            lines.append("└" + "─" * 40)
+                fk = _ref_arrow(col.references[0]) if col.references else ""
+                write(f"\n│ {marker} {col.name}: {col.data_type.value}{fk}")
+            write(_ASCII_FOOTER)
+            sep = "\n"
         
-        return "\n".join(lines)
+        return buf.getvalue()
     
     @staticmethod
     def to_html_table(schema: Schema) -> str:
         """Generate HTML table representation"""
-        html = ["<div class='schema-visualization'>"]
+        buf = io.StringIO()
+        write = buf.write
+        write("<div class='schema-visualization'>")
         
         for table in schema.tables.values():
-            html.append(f"<h3>{table.name}</h3>")
-            html.append("<table border='1' cellpadding='5'>")
-            html.append("<tr><th>Column</th><th>Type</th><th>Constraints</th></tr>")
+            write(
+                f"\n<h3>{table.name.translate(_HTML_ESCAPE)}</h3>"
+                "\n<table border='1' cellpadding='5'>"
+                "\n<tr><th>Column</th><th>Type</th><th>Constraints</th></tr>"
+            )
             
             for col in table.columns:
-                constraints = []
-                if col.primary_key:
-                    constraints.append("PK")
-                if not col.nullable:
-                    constraints.append("NOT NULL")
-                if col.unique:
-                    constraints.append("UNIQUE")
-                if col.references:
-                    constraints.append(f"FK → {col.references[0]}")
-                
-                type_str = col.data_type.value
-                if col.length:
-                    type_str += f"({col.length})"
-                
-                html.append(
-                    f"<tr><td>{col.name}</td><td>{type_str}</td>"
-                    f"<td>{', '.join(constraints)}</td></tr>"
-                )
+                write(_html_row_formatter(_html_flags(col))(col))
             
-            html.append("</table><br>")
+            write("\n</table><br>")
         
-        html.append("</div>")
-        return "\n".join(html)
+        write("\n</div>")
+        return buf.getvalue()
+    
+    @staticmethod
+    def to_html_table_bytes(schema: Schema) -> bytes:
+        """Generate HTML table representation as UTF-8 bytes, e.g. for a response body"""
+        return ERDVisualizer.to_html_table(schema).encode("utf-8")
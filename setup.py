@@ -1,8 +1,31 @@
 """Setup script for llm-dbml (fallback for older pip versions)"""
 
+import os
+import sys
+
 from setuptools import setup, find_packages
 
+# Optionally compile the ERD renderers with mypyc (LLM_DBML_COMPILE=1).
+# Falls back to the pure Python package when mypyc is not installed.
+ext_modules = []
+if os.environ.get("LLM_DBML_COMPILE") == "1":
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        print("mypyc not available, building pure Python package")
+    else:
+        # mypycify exits when type checking fails; target the running interpreter,
+        # which is what the extension is built for anyway
+        try:
+            ext_modules = mypycify([
+                "--python-version", f"{sys.version_info[0]}.{sys.version_info[1]}",
+                "llm_dbml/visualizer.py",
+            ])
+        except SystemExit:
+            print("mypyc compilation failed, building pure Python package")
+
 setup(
     packages=find_packages(where="."),
     package_dir={"": "."},
+    ext_modules=ext_modules,
 )
@@ -0,0 +1,32 @@
+"""Shared fixtures for llm_dbml tests"""
+
+import pytest
+from llm_dbml import DBSchemaCompiler
+
+
+@pytest.fixture(scope="module")
+def blog_compiler():
+    """Compiler with a users/posts schema where posts reference users"""
+    nl = """
+    Create a users table with name, email, and age.
+    Create a posts table with title and content.
+    Posts references users.
+    """
+    return DBSchemaCompiler().compile(nl, "blog_db")
+
+
+@pytest.fixture(scope="module")
+def products_compiler():
+    """Compiler with a single products table"""
+    return DBSchemaCompiler().compile("Create a products table with name and price.")
+
+
+@pytest.fixture(scope="module")
+def users_compiler():
+    """Compiler with a users/orders schema where orders belong to users"""
+    nl = """
+    Create a users table.
+    Create a orders table.
+    Orders belongs to users.
+    """
+    return DBSchemaCompiler().compile(nl)
@@ -1,7 +1,7 @@
 """Basic tests for llm_dbml"""
 
 import pytest
-from llm_dbml import DBSchemaCompiler, Schema, Table, Column, DataType
+from llm_dbml import DBSchemaCompiler, ERDVisualizer, NLParser, Schema, Table, Column, DataType
 
 
 def test_compiler_initialization():
@@ -10,17 +10,9 @@ def test_compiler_initialization():
     assert compiler.schema is None
 
 
-def test_simple_compilation():
+def test_simple_compilation(blog_compiler):
     """Test basic natural language compilation"""
-    compiler = DBSchemaCompiler()
-    
-    nl = """
-    Create a users table with name, email, and age.
-    Create a posts table with title and content.
-    Posts references users.
-    """
-    
-    compiler.compile(nl, "blog_db")
+    compiler = blog_compiler
     
     assert compiler.schema is not None
     assert compiler.schema.name == "blog_db"
@@ -79,18 +71,9 @@ def test_test_data_generation():
     assert all("name" in row for row in data["users"])
 
 
-def test_summary():
+def test_summary(blog_compiler):
     """Test schema summary"""
-    compiler = DBSchemaCompiler()
-    
-    nl = """
-    Create a users table with name and email.
-    Create a posts table with title.
-    Posts references users.
-    """
-    compiler.compile(nl)
-    
-    summary = compiler.summary()
+    summary = blog_compiler.summary()
     assert summary["num_tables"] == 2
     assert "users" in summary["tables"]
     assert "posts" in summary["tables"]
@@ -114,16 +97,9 @@ def test_manual_schema_creation():
     assert "users" in compiler.schema.tables
 
 
-def test_relationship_parsing():
+def test_relationship_parsing(users_compiler):
     """Test relationship detection"""
-    compiler = DBSchemaCompiler()
-    
-    nl = """
-    Create a users table.
-    Create a orders table.
-    Orders belongs to users.
-    """
-    compiler.compile(nl)
+    compiler = users_compiler
     
     assert len(compiler.schema.relationships) > 0
     rel = compiler.schema.relationships[0]
@@ -131,29 +107,19 @@ def test_relationship_parsing():
     assert rel.to_table == "users"
 
 
-def test_mermaid_visualization():
-    """Test Mermaid diagram generation"""
-    compiler = DBSchemaCompiler()
-    
-    nl = "Create a users table with name. Create a posts table. Posts references users."
-    compiler.compile(nl)
-    
-    mermaid = compiler.visualize_mermaid()
-    assert "erDiagram" in mermaid
-    assert "users" in mermaid
-    assert "posts" in mermaid
-
-
-def test_ascii_visualization():
-    """Test ASCII visualization"""
-    compiler = DBSchemaCompiler()
-    
-    nl = "Create a products table with name and price."
-    compiler.compile(nl)
-    
-    ascii_vis = compiler.visualize_ascii()
-    assert "products" in ascii_vis
-    assert "name" in ascii_vis
+@pytest.mark.parametrize("compiler_fixture,method,needle", [
+    ("blog_compiler", "visualize_mermaid", "erDiagram"),
+    ("blog_compiler", "visualize_mermaid", "users"),
+    ("blog_compiler", "visualize_mermaid", "posts"),
+    ("blog_compiler", "visualize_html", "<h3>posts</h3>"),
+    ("blog_compiler", "to_dbml", "Table users"),
+    ("products_compiler", "visualize_ascii", "products"),
+    ("products_compiler", "visualize_ascii", "name"),
+])
+def test_render(request, compiler_fixture, method, needle):
+    """Test DBML export and visualizations of pre-compiled schemas"""
+    compiler = request.getfixturevalue(compiler_fixture)
+    assert needle in getattr(compiler, method)()
 
 
 def test_complex_schema():
@@ -185,3 +151,228 @@ def test_complex_schema():
     is_valid, errors = compiler.validate()
     assert is_valid, f"Validation errors: {errors}"
 
+
+def test_parse_cache_returns_independent_copies():
+    """Test that cached parses do not share state between callers"""
+    nl = "Create a users table with name and email."
+    first = NLParser.parse(nl)
+    first.name = "changed"
+    first.tables["users"].add_column(Column("extra", DataType.TEXT))
+    
+    second = NLParser.parse(nl)
+    assert second.name == "database"
+    assert second.tables["users"].get_column("extra") is None
+
+
+def test_validation_reports_duplicates_and_bad_references():
+    """Test validation of duplicate columns and dangling foreign keys"""
+    schema = Schema("test_db")
+    
+    users = Table("users")
+    users.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    users.add_column(Column("name", DataType.VARCHAR))
+    users.add_column(Column("name", DataType.VARCHAR))
+    schema.add_table(users)
+    
+    posts = Table("posts")
+    posts.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    posts.add_column(Column("user_id", DataType.INTEGER, references=("users", "uid")))
+    schema.add_table(posts)
+    
+    errors = schema.validate()
+    assert "Table 'users' has duplicate column names: {'name'}" in errors
+    assert any("non-existent column 'users.uid'" in e for e in errors)
+    
+    users.get_column("id").name = "uid"
+    assert not any("non-existent column" in e for e in schema.validate())
+
+
+def test_test_data_respects_foreign_key_order():
+    """Test that referenced tables are generated before dependents"""
+    schema = Schema("test_db")
+    
+    posts = Table("posts")
+    posts.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    posts.add_column(Column("user_id", DataType.INTEGER, references=("users", "id")))
+    schema.add_table(posts)
+    
+    users = Table("users")
+    users.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    schema.add_table(users)
+    
+    data = DBSchemaCompiler().load_schema(schema).generate_test_data(num_rows=3)
+    assert list(data) == ["users", "posts"]
+    assert all(row["user_id"] in {1, 2, 3} for row in data["posts"])
+
+
+def test_test_data_rejects_circular_references():
+    """Test that circular foreign keys raise instead of looping forever"""
+    schema = Schema("test_db")
+    
+    a = Table("a")
+    a.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    a.add_column(Column("b_id", DataType.INTEGER, references=("b", "id")))
+    schema.add_table(a)
+    
+    b = Table("b")
+    b.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    b.add_column(Column("a_id", DataType.INTEGER, references=("a", "id")))
+    schema.add_table(b)
+    
+    with pytest.raises(ValueError, match="Circular"):
+        DBSchemaCompiler().load_schema(schema).generate_test_data()
+
+
+def test_compile_cache_isolates_schemas():
+    """Test that repeated compiles of one description get independent schemas"""
+    nl = "Create a users table with name and email."
+    
+    first = DBSchemaCompiler().compile(nl, "first")
+    first.schema.tables["users"].add_column(Column("extra", DataType.TEXT))
+    second = DBSchemaCompiler().compile(nl, "second")
+    
+    assert first.schema.name == "first"
+    assert second.schema.name == "second"
+    assert second.schema.tables["users"].get_column("extra") is None
+    
+    DBSchemaCompiler.clear_cache()
+    assert DBSchemaCompiler().compile(nl).to_dbml() == second.to_dbml().replace(
+        "// Database: second", "// Database: database"
+    )
+
+
+def test_test_data_generation_is_reproducible_with_seed():
+    """Test that seeded test data generation is deterministic"""
+    compiler = DBSchemaCompiler()
+    compiler.compile(
+        "Create a users table with first_name, full_name, is_active boolean, "
+        "signup date, and created_at datetime."
+    )
+    
+    first = compiler.generate_test_data(num_rows=20, seed=42)
+    second = compiler.generate_test_data(num_rows=20, seed=42)
+    assert first == second
+    assert len(first["users"]) == 20
+
+
+def test_schema_clone_is_independent():
+    """Test that mutating a cloned schema leaves the original untouched"""
+    schema = Schema("test_db")
+    users = Table("users")
+    users.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    users.add_column(Column("name", DataType.VARCHAR, length=100))
+    schema.add_table(users)
+    
+    clone = schema.clone()
+    clone.tables["users"].get_column("name").nullable = False
+    clone.tables["users"].add_column(Column("email", DataType.VARCHAR))
+    
+    assert schema.tables["users"].get_column("name").nullable
+    assert schema.tables["users"].get_column("email") is None
+    assert clone.to_dbml() != schema.to_dbml()
+
+
+def test_rendered_outputs_are_cached_until_reload():
+    """Test that exports are reused until the schema changes or is replaced"""
+    compiler = DBSchemaCompiler()
+    compiler.compile(
+        "Create a users table with name. Create a posts table. Posts references users."
+    )
+    
+    mermaid = compiler.visualize_mermaid()
+    assert compiler.visualize_mermaid() is mermaid
+    
+    compiler.get_schema().add_table(Table("comments", [Column("id", DataType.INTEGER)]))
+    assert "comments" in compiler.visualize_mermaid()
+    
+    schema = compiler.get_schema()
+    schema.tables["comments"] = Table("comments", [Column("cid", DataType.INTEGER)])
+    assert "cid" in compiler.visualize_mermaid()
+    
+    assert "// Database: database" in compiler.to_dbml()
+    compiler.get_schema().name = "renamed_db"
+    assert "// Database: renamed_db" in compiler.to_dbml()
+    
+    schema = Schema("other_db")
+    schema.add_table(Table("tags", [Column("id", DataType.INTEGER, primary_key=True)]))
+    compiler.load_schema(schema)
+    assert "tags" in compiler.visualize_mermaid()
+    assert "users" not in compiler.visualize_mermaid()
+
+
+def test_visualizer_reflects_schema_edits():
+    """Test that renderings always reflect the current schema"""
+    schema = Schema("test_db")
+    users = Table("users")
+    users.add_column(Column("id", DataType.INTEGER, primary_key=True, nullable=False))
+    users.add_column(Column("email", DataType.VARCHAR, length=255))
+    schema.add_table(users)
+    assert "email" in ERDVisualizer.to_mermaid(schema)
+    
+    users.get_column("email").name = "contact"
+    users.get_column("id").primary_key = False
+    mermaid = ERDVisualizer.to_mermaid(schema)
+    assert "contact" in mermaid
+    assert "PK" not in mermaid
+    
+    schema.tables["users"] = Table("users", [Column("uid", DataType.INTEGER)])
+    assert "uid" in ERDVisualizer.to_ascii(schema)
+
+
+def test_column_type_str_follows_edits():
+    """Test that the cached type string tracks type and length changes"""
+    col = Column("email", DataType.VARCHAR, length=255)
+    assert col.type_str == "varchar(255)"
+    
+    col.length = 100
+    assert col.type_str == "varchar(100)"
+    
+    col.data_type = DataType.TEXT
+    col.length = None
+    assert col.type_str == "text"
+
+
+def test_html_table_escapes_names():
+    """Test that names are HTML-escaped in the table visualization"""
+    schema = Schema("test_db")
+    schema.add_table(Table("a<b", [Column("id", DataType.INTEGER, primary_key=True)]))
+    schema.add_table(Table("c", [Column('x&"y', DataType.INTEGER, references=("a<b", "id"))]))
+    
+    html = ERDVisualizer.to_html_table(schema)
+    assert "<h3>a&lt;b</h3>" in html
+    assert "<td>x&amp;&quot;y</td>" in html
+    assert "FK → a&lt;b" in html
+    assert "a<b" not in html
+    assert ERDVisualizer.to_html_table_bytes(schema) == html.encode("utf-8")
+
+
+def test_get_column_follows_in_place_edits():
+    """Test that column lookup reflects renamed and replaced columns"""
+    users = Table("users", [Column("id", DataType.INTEGER), Column("email", DataType.VARCHAR)])
+    assert users.get_column("email") is users.columns[1]
+    
+    users.get_column("email").name = "contact"
+    assert users.get_column("email") is None
+    assert users.get_column("contact") is users.columns[1]
+    
+    users.columns[1] = Column("phone", DataType.VARCHAR)
+    assert users.get_column("phone") is users.columns[1]
+
+
+def test_required_markers_inside_punctuation():
+    """Test that required/mandatory markers wrapped in punctuation are honored"""
+    schema = NLParser.parse("Create a users table with email, title [mandatory] and sku required?")
+    users = schema.tables["users"]
+    assert not users.get_column("title").nullable
+    assert not users.get_column("sku").nullable
+
+
+def test_column_view_reflects_in_place_edits():
+    """Test that the column view is taken from the current column attributes"""
+    users = Table("users", [Column("id", DataType.INTEGER, primary_key=True)])
+    users.columns[0].name = "uid"
+    users.columns[0].primary_key = False
+    
+    view = users.column_view()
+    assert view.names == ["uid"]
+    assert view.primary_keys == [False]